@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     github_repo: str = Field(..., env="GITHUB_REPO")
     github_token: str = Field(..., env="GITHUB_TOKEN")
     state_file: Path = Field(default=Path("state/state.json"), env="STATE_FILE")
+    state_fsync: bool = Field(default=False, env="STATE_FSYNC")
     poll_interval_seconds: int = Field(default=120, env="POLL_INTERVAL_SECONDS")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
 
@@ -29,6 +30,4 @@ class Settings(BaseSettings):
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    settings = Settings()
-    settings.state_file.parent.mkdir(parents=True, exist_ok=True)
-    return settings
+    return Settings()
@@ -3,34 +3,33 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from dataclasses import asdict
 from typing import Any
 
 from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from .config import Settings, get_settings
-from .slack_sync import SlackSyncStats, run_sync
+from .slack_sync import SlackSyncStats, aclose_client, open_client, run_sync
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
 
-logging.basicConfig(
-    level=get_settings().log_level,
-    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
-)
 logger = logging.getLogger("codex_runner")
 
-app = FastAPI(title="Codex Runner", version="1.0.0")
+app = FastAPI(title="Codex Runner", version="1.0.0", default_response_class=ORJSONResponse)
 
-_settings: Settings = get_settings()
-_loop_lock = asyncio.Lock()
+_settings: Settings
 _last_stats: SlackSyncStats | None = None
 _last_error: str | None = None
 _last_run_epoch: float | None = None
 _polling_task: asyncio.Task[Any] | None = None
+_current_run: asyncio.Task[SlackSyncStats] | None = None
 
 
 async def _sync_once() -> SlackSyncStats:
     global _last_stats, _last_error, _last_run_epoch
     try:
-        result = await asyncio.to_thread(run_sync, _settings)
+        result = await run_sync(_settings)
         _last_stats = result
         _last_error = None
         _last_run_epoch = time.time()
@@ -42,12 +41,18 @@ async def _sync_once() -> SlackSyncStats:
         raise
 
 
+def _start_or_join_sync() -> asyncio.Task[SlackSyncStats]:
+    global _current_run
+    if _current_run is None or _current_run.done():
+        _current_run = asyncio.create_task(_sync_once())
+    return _current_run
+
+
 async def _poll_loop() -> None:
     logger.info("Starting Slack→GitHub poller (interval=%ss)", _settings.poll_interval_seconds)
     while True:
         try:
-            async with _loop_lock:
-                await _sync_once()
+            await _start_or_join_sync()
         except Exception:
             # error already logged in _sync_once
             pass
@@ -56,7 +61,14 @@ async def _poll_loop() -> None:
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    global _polling_task
+    global _polling_task, _settings
+    _settings = get_settings()
+    open_client()
+    logging.basicConfig(level=_settings.log_level, format=LOG_FORMAT)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
     if _polling_task is None or _polling_task.done():
         _polling_task = asyncio.create_task(_poll_loop())
 
@@ -70,32 +82,30 @@ async def on_shutdown() -> None:
             await _polling_task
         except asyncio.CancelledError:  # noqa: PERF203
             pass
+    await aclose_client()
 
 
 @app.get("/healthz")
-async def healthz() -> JSONResponse:
+async def healthz() -> ORJSONResponse:
     body = {
         "last_run_epoch": _last_run_epoch,
-        "last_stats": _last_stats.to_dict() if _last_stats else None,
+        "last_stats": asdict(_last_stats) if _last_stats else None,
         "last_error": _last_error,
         "poll_interval_seconds": _settings.poll_interval_seconds,
     }
     status_code = status.HTTP_200_OK if _last_error is None else status.HTTP_503_SERVICE_UNAVAILABLE
-    return JSONResponse(body, status_code=status_code)
+    return ORJSONResponse(body, status_code=status_code)
 
 
 @app.post("/sync-now")
-async def sync_now() -> JSONResponse:
-    if _loop_lock.locked():
-        raise HTTPException(status_code=423, detail="Sync already running")
-    async with _loop_lock:
-        try:
-            result = await _sync_once()
-        except Exception as exc:  # noqa: BLE001
-            raise HTTPException(status_code=500, detail=str(exc)) from exc
-        return JSONResponse({
-            "processed_messages": result.processed_messages,
-            "created_issues": result.created_issues,
-            "last_timestamp": result.last_timestamp,
-            "run_epoch": _last_run_epoch,
-        })
+async def sync_now() -> ORJSONResponse:
+    try:
+        result = await asyncio.shield(_start_or_join_sync())
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return ORJSONResponse({
+        "processed_messages": result.processed_messages,
+        "created_issues": result.created_issues,
+        "last_timestamp": result.last_timestamp,
+        "run_epoch": _last_run_epoch,
+    })
@@ -1,84 +1,232 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
+import fcntl
 import logging
+import operator
+import os
 import time
-import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
+
+import httpx
+import orjson
 
 from .config import Settings
 
 logger = logging.getLogger(__name__)
 
 SLACK_API_BASE = "https://slack.com/api/"
+GITHUB_API_BASE = "https://api.github.com/"
+COMMAND_PREFIXES: tuple[str, ...] = ("/codex",)
+ISSUE_LABELS = ["codex-runner", "from-slack"]
+DEFAULT_ISSUE_TITLE = "Slack Codex Request"
+MAX_CONCURRENT_ISSUES = 8
+SERVER_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+MAX_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_DELAY_SECONDS = 60.0
+STATE_LOCK_POLL_SECONDS = 0.5
+
+_CLIENT: httpx.AsyncClient | None = None
+
+_STATE_CACHE: tuple[Path, tuple[int, int], dict[str, Any]] | None = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class SlackSyncStats:
     processed_messages: int
     created_issues: int
     last_timestamp: float
 
-    def to_dict(self) -> dict[str, float | int]:
-        return {
-            "processed_messages": self.processed_messages,
-            "created_issues": self.created_issues,
-            "last_timestamp": self.last_timestamp,
-        }
-
-
-def _slack_request(token: str, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-    url = urllib.parse.urljoin(SLACK_API_BASE, method)
-    if params:
-        url = f"{url}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
-    with urllib.request.urlopen(req) as resp:  # noqa: S310
-        payload = json.loads(resp.read().decode("utf-8"))
+
+def open_client() -> None:
+    global _CLIENT
+    if _CLIENT is None:
+        transport = httpx.AsyncHTTPTransport(
+            retries=3,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=MAX_CONCURRENT_ISSUES),
+        )
+        _CLIENT = httpx.AsyncClient(transport=transport, timeout=30.0)
+
+
+async def aclose_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and (
+        "Retry-After" in resp.headers or resp.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def _should_retry(method: str, resp: httpx.Response) -> bool:
+    if _is_rate_limited(resp):
+        return True
+    return method == "GET" and resp.status_code in SERVER_ERROR_STATUSES
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if reset is not None and resp.headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            return max(float(reset) - time.time(), 0.0)
+        except ValueError:
+            pass
+    return RETRY_BACKOFF_SECONDS * (2**attempt)
+
+
+async def _send(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    if _CLIENT is None:
+        raise RuntimeError("HTTP client is not open; call open_client() first")
+    attempt = 0
+    while True:
+        resp = await _CLIENT.request(method, url, **kwargs)
+        if attempt >= MAX_RETRIES or not _should_retry(method, resp):
+            return resp
+        delay = _retry_delay(resp, attempt)
+        if delay > MAX_RETRY_DELAY_SECONDS:
+            logger.warning("%s %s returned %s; retry delay %.0fs exceeds cap", method, url, resp.status_code, delay)
+            return resp
+        logger.warning("%s %s returned %s; retrying in %.1fs", method, url, resp.status_code, delay)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _slack_request(token: str, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    resp = await _send(
+        "GET",
+        f"{SLACK_API_BASE}{method}",
+        params=params,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    resp.raise_for_status()
+    payload = orjson.loads(resp.content)
     if not payload.get("ok"):
         raise RuntimeError(f"Slack API error ({method}): {payload}")
     return payload
 
 
+def _state_version(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_ino, stat.st_mtime_ns
+
+
 def _load_state(path: Path) -> dict[str, Any]:
-    if not path.exists():
+    global _STATE_CACHE
+    try:
+        version = _state_version(path)
+    except FileNotFoundError:
         return {"last_ts": "0"}
+    if _STATE_CACHE is not None and _STATE_CACHE[0] == path and _STATE_CACHE[1] == version:
+        return _STATE_CACHE[2]
     logger.debug("Loading Slack cursor from %s", path)
-    return json.loads(path.read_text(encoding="utf-8"))
+    state = orjson.loads(path.read_bytes())
+    _STATE_CACHE = (path, version, state)
+    return state
 
 
-def _save_state(path: Path, state: dict[str, Any]) -> None:
+def _save_state(path: Path, state: dict[str, Any], fsync: bool = False) -> None:
+    global _STATE_CACHE
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    # Write a sibling file and swap it in so a crash mid-write never leaves a truncated cursor.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        if fsync:
+            fh.flush()
+            os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+    if fsync:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    _STATE_CACHE = (path, _state_version(path), state)
     logger.debug("Saved Slack cursor to %s: %s", path, state)
 
 
-def _fetch_new_messages(token: str, channel: str, oldest: str) -> list[dict[str, Any]]:
-    messages: list[dict[str, Any]] = []
-    cursor: str | None = None
-    while True:
-        params: dict[str, Any] = {"channel": channel, "oldest": oldest, "limit": 200}
-        if cursor:
-            params["cursor"] = cursor
-        payload = _slack_request(token, "conversations.history", params)
-        messages.extend(payload.get("messages", []))
-        cursor = payload.get("response_metadata", {}).get("next_cursor")
-        if not cursor:
-            break
-    messages.sort(key=lambda item: float(item.get("ts", "0")))
-    return [m for m in messages if float(m.get("ts", "0")) > float(oldest)]
+@contextlib.asynccontextmanager
+async def _state_lock(path: Path) -> AsyncIterator[None]:
+    lock_path = path.with_name(f"{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("w") as fh:
+        while True:
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(STATE_LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _is_codex_request(message: dict[str, Any]) -> bool:
+    if message.get("subtype"):
+        return False
+    return message.get("text", "").lstrip().startswith(COMMAND_PREFIXES)
+
+
+async def _fetch_history_page(token: str, channel: str, oldest: str, cursor: str | None) -> dict[str, Any]:
+    params: dict[str, Any] = {"channel": channel, "oldest": oldest, "limit": 200}
+    if cursor:
+        params["cursor"] = cursor
+    return await _slack_request(token, "conversations.history", params)
 
 
-def _format_issue(message: dict[str, Any], channel: str) -> tuple[str, str]:
+async def _fetch_new_messages(token: str, channel: str, oldest: str) -> tuple[int, list[tuple[float, dict[str, Any]]]]:
+    fetched = 0
+    oldest_ts = float(oldest)
+    messages: list[tuple[float, dict[str, Any]]] = []
+    next_page: asyncio.Task[dict[str, Any]] | None = asyncio.create_task(
+        _fetch_history_page(token, channel, oldest, None)
+    )
+    try:
+        while next_page is not None:
+            payload = await next_page
+            cursor = payload.get("response_metadata", {}).get("next_cursor")
+            next_page = None
+            if cursor and payload.get("has_more") is not False:
+                next_page = asyncio.create_task(_fetch_history_page(token, channel, oldest, cursor))
+                await asyncio.sleep(0)
+            page = payload.get("messages", [])
+            fetched += len(page)
+            for message in page:
+                if not _is_codex_request(message):
+                    continue
+                ts = float(message.get("ts", "0"))
+                if ts > oldest_ts:
+                    messages.append((ts, message))
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+    messages.sort(key=operator.itemgetter(0))
+    return fetched, messages
+
+
+def _format_issue(message: dict[str, Any], ts_float: float, channel: str) -> tuple[str, str]:
     text = message.get("text", "").strip()
     user = message.get("user", "unknown")
     ts = message.get("ts", "0")
-    ts_float = float(ts)
     human_time = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts_float))
     link = f"https://slack.com/app_redirect?channel={channel}&message_ts={ts}"
-    title = text.splitlines()[0][:80] or "Slack Codex Request"
+    title = text.splitlines()[0][:80] or DEFAULT_ISSUE_TITLE
     body = (
         "### Slackリクエスト\n"
         f"- 投稿者: `{user}`\n"
@@ -89,40 +237,84 @@ def _format_issue(message: dict[str, Any], channel: str) -> tuple[str, str]:
     return title, body
 
 
-def _create_issue(repo: str, token: str, title: str, body: str, labels: list[str]) -> None:
-    url = f"https://api.github.com/repos/{repo}/issues"
-    payload = json.dumps({"title": title, "body": body, "labels": labels}).encode("utf-8")
-    req = urllib.request.Request(url, data=payload, method="POST")
-    req.add_header("Authorization", f"token {token}")
-    req.add_header("Accept", "application/vnd.github+json")
-    req.add_header("Content-Type", "application/json")
-    with urllib.request.urlopen(req) as resp:  # noqa: S310
-        if resp.status >= 300:
-            detail = resp.read().decode("utf-8")
-            raise RuntimeError(f"GitHub issue creation failed: {detail}")
+async def _create_issue(repo: str, token: str, title: str, body: str, labels: list[str]) -> None:
+    resp = await _send(
+        "POST",
+        f"{GITHUB_API_BASE}repos/{repo}/issues",
+        content=orjson.dumps({"title": title, "body": body, "labels": labels}),
+        headers={
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json",
+            "Content-Type": "application/json",
+        },
+    )
+    if resp.status_code >= 300:
+        raise RuntimeError(f"GitHub issue creation failed: {resp.text}")
+
 
+async def run_sync(settings: Settings) -> SlackSyncStats:
+    async with _state_lock(settings.state_file):
+        return await _run_sync_locked(settings)
+
+
+async def _run_sync_locked(settings: Settings) -> SlackSyncStats:
+    channel = settings.slack_channel_id
+    repo = settings.github_repo
+    github_token = settings.github_token
 
-def run_sync(settings: Settings) -> SlackSyncStats:
     state = _load_state(settings.state_file)
     oldest = state.get("last_ts", "0")
+    already_posted = set(state.get("posted_ts", ()))
 
-    messages = _fetch_new_messages(settings.slack_bot_token, settings.slack_channel_id, oldest)
+    fetched, pending = await _fetch_new_messages(settings.slack_bot_token, channel, oldest)
     processed_ts = float(oldest)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ISSUES)
+    failed = asyncio.Event()
+
+    async def _post(ts: float, message: dict[str, Any]) -> bool:
+        title, body = _format_issue(message, ts, channel)
+        async with semaphore:
+            if failed.is_set():
+                return False
+            try:
+                await _create_issue(repo, github_token, title, body, ISSUE_LABELS)
+            except Exception:
+                failed.set()
+                raise
+        return True
+
+    to_post = [(ts, m) for ts, m in pending if m.get("ts", "0") not in already_posted]
+    results = await asyncio.gather(*(_post(ts, m) for ts, m in to_post), return_exceptions=True)
+
     created = 0
+    error: BaseException | None = None
+    posted = set(already_posted)
+    for (_, message), result in zip(to_post, results):
+        if isinstance(result, BaseException):
+            error = error or result
+        elif result:
+            created += 1
+            posted.add(message.get("ts", "0"))
+
+    # The cursor advances through the leading run of posted messages. Issues created past
+    # a failure are remembered in posted_ts so the retry on the next poll skips them.
+    for ts, message in pending:
+        if message.get("ts", "0") not in posted:
+            break
+        processed_ts = max(processed_ts, ts)
+    posted_ts = sorted((key for key in posted if float(key) > processed_ts), key=float)
+
+    last_ts = f"{processed_ts:.6f}"
+    if (processed_ts > float(oldest) and last_ts != oldest) or set(posted_ts) != already_posted:
+        new_state: dict[str, Any] = {"last_ts": last_ts}
+        if posted_ts:
+            new_state["posted_ts"] = posted_ts
+        _save_state(settings.state_file, new_state, fsync=settings.state_fsync)
+
+    if error is not None:
+        logger.warning("Slack sync failed after creating %s issue(s); last_ts=%.6f", created, processed_ts)
+        raise error
 
-    for message in messages:
-        if message.get("subtype"):
-            continue
-        text = message.get("text", "").strip()
-        if not text.startswith("/codex"):
-            continue
-        title, body = _format_issue(message, settings.slack_channel_id)
-        _create_issue(settings.github_repo, settings.github_token, title, body, ["codex-runner", "from-slack"])
-        created += 1
-        processed_ts = max(processed_ts, float(message.get("ts", processed_ts)))
-
-    if created:
-        _save_state(settings.state_file, {"last_ts": f"{processed_ts:.6f}"})
-
-    logger.info("Slack sync: processed=%s created=%s last_ts=%.6f", len(messages), created, processed_ts)
-    return SlackSyncStats(processed_messages=len(messages), created_issues=created, last_timestamp=processed_ts)
+    logger.info("Slack sync: processed=%s created=%s last_ts=%.6f", fetched, created, processed_ts)
+    return SlackSyncStats(processed_messages=fetched, created_issues=created, last_timestamp=processed_ts)